@@ -1,97 +1,258 @@
-import datetime
 import time
+import atexit
+import heapq
 import os
+import sys
+from collections import deque
 
 start_time = time.time()
 
+INFINITY = 16  # Metrica "infinita" di RIP (RFC 2453): destinazione irraggiungibile
+
+# Formato delle righe delle tabelle di routing, analizzato una sola volta
+_ROW_FMT = "{:<12} {:<10} {:<10}\n".format
+_TABLE_HEADER = _ROW_FMT("Destination", "Cost", "Next Hop") + "-" * 34 + "\n"
+
+
+def _relax(cost, next_hop, selfId, neighborId, linkCost, neighborTable, neighborNextHop):
+    """
+    Applica la regola di Bellman-Ford al vettore dei costi di un nodo
+    usando la tabella annunciata da un vicino, modificando cost e next_hop sul posto.
+
+    Applica lo split horizon con poisoned reverse: le destinazioni che il
+    vicino raggiunge attraverso questo nodo sono considerate irraggiungibili
+    (INFINITY), evitando il count-to-infinity.
+
+    Argomenti:
+        cost (list): Vettore dei costi del nodo, indicizzato per id.
+        next_hop (list): Vettore dei next hop del nodo, indicizzato per id.
+        selfId (int): Id del nodo stesso.
+        neighborId (int): Id del vicino che condivide la tabella.
+        linkCost (int): Costo del collegamento verso il vicino.
+        neighborTable (list): Vettore dei costi del vicino, indicizzato per id.
+        neighborNextHop (list): Vettore dei next hop del vicino, indicizzato per id.
+
+    Ritorna:
+        tuple: Lista degli id delle destinazioni la cui voce è stata modificata
+            e True se almeno un costo è aumentato, False altrimenti.
+    """
+    # Un solo passaggio sui vettori: costo e next hop vengono scritti insieme.
+    # Si itera per indice per non allocare una tupla per ogni destinazione.
+    changes = []
+    worsened = False
+    for destination in range(len(neighborTable)):
+        if neighborNextHop[destination] == selfId:
+            new = INFINITY
+        else:
+            new = min(linkCost + neighborTable[destination], INFINITY)
+        current = cost[destination]
+        if (new < current or (next_hop[destination] == neighborId and new != current)) and destination != selfId:
+            cost[destination] = new
+            next_hop[destination] = neighborId
+            changes.append(destination)
+            worsened = worsened or new > current
+    return changes, worsened
+
 
 class Node:
-    def __init__(self, name):
+    def __init__(self, name, nodeId, names):
         self.name = name
-        self.routingTable = {name: (0, name)} 
-        self.neighbors = {} 
-
-    def updateRoutingTable(self, neighborName, neighborTable):
+        self.id = nodeId
+        self._names = names  # Nomi dei nodi indicizzati per id, condivisi con la rete
+        # Tabella di routing come vettori paralleli indicizzati per id della destinazione
+        self.cost = [INFINITY] * len(names)
+        self.next_hop = [-1] * len(names)  # -1 se il next hop è sconosciuto
+        self.cost[nodeId] = 0
+        self.next_hop[nodeId] = nodeId
+        self.neighbors = []  # Lista di tuple (id vicino, costo)
+        self.last_seen = []  # Per ogni vicino: epoche delle due tabelle all'ultimo aggiornamento
+        self.epoch = 0  # Incrementato a ogni modifica della tabella di routing
+
+    def collectChanges(self, neighborId, linkCost, neighborTable, neighborNextHop):
         """
         Aggiorna la tabella di routing basata sulle informazioni ricevute dal vicino.
+
+        Una destinazione viene aggiornata se il nuovo costo è strettamente minore,
+        oppure se il vicino è già il next hop e annuncia un costo diverso
+        (ad esempio infinito dopo un guasto del collegamento).
+
+        Argomenti:
+            neighborId (int): Id del vicino che condivide la tabella.
+            linkCost (int): Costo del collegamento verso il vicino.
+            neighborTable (list): Vettore dei costi del vicino, indicizzato per id.
+            neighborNextHop (list): Vettore dei next hop del vicino, indicizzato per id.
+
+        Ritorna:
+            tuple: Lista degli id delle destinazioni la cui voce è stata modificata
+                e True se almeno un costo è aumentato, False altrimenti.
         """
-        updated = False
-        for destination, (neighborCost, nextHop) in neighborTable.items():
-            if destination == self.name: 
-                continue
-            current_cost, currentHop = self.routingTable.get(destination, (float('inf'), None))
-            new_cost = self.neighbors[neighborName] + neighborCost
-            if new_cost < current_cost:
-                self.routingTable[destination] = (new_cost, neighborName)
-                updated = True 
-        return updated
+        changes, worsened = _relax(self.cost, self.next_hop, self.id, neighborId, linkCost, neighborTable, neighborNextHop)
+        if changes:
+            self.epoch += 1
+        return changes, worsened
 
     def shareTable(self):
         """
         Condivide la propria tabella di routing con i vicini.
+
+        Ritorna:
+            tuple: L'epoca corrente della tabella e il vettore dei costi, senza copia.
         """
-        return self.routingTable
+        return self.epoch, self.cost
 
-    def disconnectNeighbor(self, neighborName):
+    def routes(self):
+        """
+        Restituisce le voci della tabella di routing come tuple
+        (destinazione, costo, next hop), con "inf" per le destinazioni
+        irraggiungibili e None se il next hop è sconosciuto o la
+        destinazione è irraggiungibile.
+        """
+        for dest, cost in enumerate(self.cost):
+            if cost >= INFINITY:
+                # next_hop resta memorizzato per accettare gli aggiornamenti dello stesso vicino
+                yield self._names[dest], "inf", None
+            else:
+                hop = self.next_hop[dest]
+                yield self._names[dest], cost, self._names[hop] if hop >= 0 else None
+
+    def disconnectNeighbor(self, neighborId):
         """
         Simula un guasto disconnettendo un vicino.
         
-        Aggiorna il costo verso il vicino disconnesso a infinito (inf)
+        Aggiorna il costo verso il vicino disconnesso a infinito (INFINITY)
         e lo rimuove dalla tabella di routing.
 
         Argomenti:
-            neighborName (str): Nome del nodo vicino da disconnettere.
+            neighborId (int): Id del nodo vicino da disconnettere.
 
         """
 
-        if neighborName in self.neighbors:
-            self.neighbors[neighborName] = float('inf')  # Costo infinito
-            self.routingTable[neighborName] = (float('inf'), None)
+        for i, (otherId, _) in enumerate(self.neighbors):
+            if otherId == neighborId:
+                self.neighbors[i] = (neighborId, INFINITY)  # Costo infinito
+                self.cost[neighborId] = INFINITY
+                self.next_hop[neighborId] = -1
+                self.epoch += 1
 
     def __str__(self):
         """
         Stampa il nodo e la sua tabella di routing.
         """
-        table = "\n".join([f"{dest}: cost {cost}, next hop {hop}" for dest, (cost, hop) in self.routingTable.items()])
+        table = "\n".join([f"{dest}: cost {cost}, next hop {hop}" for dest, cost, hop in self.routes()])
         return f"Node {self.name} Routing Table:\n{table}"
 
 
 class Network:
-    def __init__(self):
+    def __init__(self, log_path=None):
         self.nodes = {}
+        self._id = {}  # Nome del nodo -> id
+        self._name = []  # Id del nodo -> nome
+        self._nodes_by_id = []  # Id del nodo -> nodo
+        self.dirty = deque()  # Id dei nodi da rielaborare nella prossima iterazione
+        self.in_queue = set()
+        self._log_filename = log_path  # File di log, aperto alla prima scrittura
+        self._log_fh = None
+        self._log_header_written = False
+
+    def _enqueue(self, nodeId):
+        """
+        Inserisce un nodo nella coda dei nodi da rielaborare, se non è già presente.
+        """
+        if nodeId not in self.in_queue:
+            self.in_queue.add(nodeId)
+            self.dirty.append(nodeId)
+
+    def _tableChanged(self, nodeId):
+        """
+        Mette in coda un nodo la cui tabella è stata modificata direttamente
+        (fuori da collectChanges) insieme ai suoi vicini, che devono ricevere
+        la tabella aggiornata.
+        """
+        self._enqueue(nodeId)
+        for neighborId, _ in self._nodes_by_id[nodeId].neighbors:
+            self._enqueue(neighborId)
 
     def addNode(self, name):
         """
         Aggiunge un nuovo nodo alla rete.
+
+        Al nodo viene assegnato un id progressivo e le tabelle di routing
+        dei nodi esistenti vengono estese con la nuova destinazione.
         """
-        self.nodes[name] = Node(name)
+        nodeId = len(self._name)
+        self._id[name] = nodeId
+        self._name.append(name)
+        for node in self.nodes.values():
+            node.cost.append(INFINITY)
+            node.next_hop.append(-1)
+        node = Node(name, nodeId, self._name)
+        self.nodes[name] = node
+        self._nodes_by_id.append(node)
 
     def connectNodes(self, node1, node2, cost):
         """
         Connette due nodi con un collegamento bidirezionale.
         """
         if node1 in self.nodes and node2 in self.nodes:
-            self.nodes[node1].neighbors[node2] = cost
-            self.nodes[node2].neighbors[node1] = cost
-            self.nodes[node1].routingTable[node2] = (cost, node2)
-            self.nodes[node2].routingTable[node1] = (cost, node1)
+            id1, id2 = self._id[node1], self._id[node2]
+            cost = min(cost, INFINITY - 1)  # Il costo massimo di un collegamento in RIP è 15
+            for node, otherId in ((self.nodes[node1], id2), (self.nodes[node2], id1)):
+                # Un collegamento già esistente viene aggiornato, non duplicato
+                for k, (neighborId, _) in enumerate(node.neighbors):
+                    if neighborId == otherId:
+                        node.neighbors[k] = (otherId, cost)
+                        break
+                else:
+                    node.neighbors.append((otherId, cost))
+                    node.last_seen.append(None)
+                node.cost[otherId] = cost
+                node.next_hop[otherId] = otherId
+                node.epoch += 1
+            self._tableChanged(id1)
+            self._tableChanged(id2)
 
     def simulateIteration(self):
         """
         Simula un'iterazione del protocollo RIP.
         
-        Ogni nodo condivide la propria tabella di routing con i vicini e 
-        aggiorna la propria tabella in base alle informazioni ricevute.
+        Vengono elaborati solo i nodi in coda (triggered update): ciascuno
+        aggiorna la propria tabella con quelle dei vicini e, se qualcosa è
+        cambiato, mette in coda i propri vicini per l'iterazione successiva.
+        Se un costo è aumentato il nodo rimette in coda anche se stesso, così
+        che i vicini già considerati vengano confrontati di nuovo con il
+        costo peggiorato.
+        Le coppie (nodo, vicino) le cui tabelle non sono cambiate dall'ultimo
+        aggiornamento vengono saltate.
+
+        La rete è convergente quando la coda dirty è vuota.
 
         Ritorna:
             bool: True se almeno una tabella di routing è stata modificata, False altrimenti.
         """
         
         updated = False
-        for nodeName, node in self.nodes.items():
-            for neighborName in node.neighbors.keys():
-                if neighborName in self.nodes:
-                    updated |= node.updateRoutingTable(neighborName, self.nodes[neighborName].shareTable())
+        nodes = self._nodes_by_id
+        for _ in range(len(self.dirty)):
+            nodeId = self.dirty.popleft()
+            self.in_queue.discard(nodeId)
+            node = nodes[nodeId]
+            changes = []
+            worsened = False
+            for k, (neighborId, linkCost) in enumerate(node.neighbors):
+                neighbor = nodes[neighborId]
+                if node.last_seen[k] == (neighbor.epoch, node.epoch):
+                    continue
+                epoch, neighborCost = neighbor.shareTable()
+                neighborChanges, neighborWorsened = node.collectChanges(neighborId, linkCost, neighborCost, neighbor.next_hop)
+                changes += neighborChanges
+                worsened = worsened or neighborWorsened
+                node.last_seen[k] = (epoch, node.epoch)
+            if changes:
+                updated = True
+                for neighborId, _ in node.neighbors:
+                    self._enqueue(neighborId)
+            if worsened:
+                self._enqueue(nodeId)
         return updated
 
     def simulateFailure(self, node1, node2):
@@ -106,121 +267,228 @@ class Network:
         if node1 not in self.nodes or node2 not in self.nodes:
             print(f"Errore: {node1} o {node2} non esiste nella rete.")
             return
-        self.nodes[node1].disconnectNeighbor(node2)
-        self.nodes[node2].disconnectNeighbor(node1)
+        id1, id2 = self._id[node1], self._id[node2]
+        self.nodes[node1].disconnectNeighbor(id2)
+        self.nodes[node2].disconnectNeighbor(id1)
+        self._tableChanged(id1)
+        self._tableChanged(id2)
+        # Il log fino al guasto viene reso persistente
+        if self._log_fh is not None:
+            self._log_fh.flush()
+
+    def _openLog(self, filename):
+        """
+        Apre il file di log in append e lo mantiene aperto fino alla fine del programma.
 
-    def logRoutingTables(self, filename, event=""):
+        Argomenti:
+            filename (str): Nome del file di log.
+        """
+
+        if self._log_fh is None:
+            # Registrato una sola volta: chiude il file di log corrente all'uscita
+            atexit.register(self._closeLog)
+        else:
+            self._log_fh.close()
+        # Controlla se il file esiste già solo all'apertura
+        self._log_header_written = os.path.isfile(filename)
+        self._log_filename = filename
+        self._log_fh = open(filename, "a", buffering=65536)
+
+    def _closeLog(self):
+        """
+        Chiude il file di log corrente, se aperto.
+        """
+        if self._log_fh is not None:
+            self._log_fh.close()
+
+    def logRoutingTables(self, filename=None, event="", timestamp=None):
         """
         Registra lo stato delle tabelle di routing in un file di log con timestamp.
 
         Argomenti:
-            filename (str): Nome del file di log.
+            filename (str, opzionale): Nome del file di log. Default None, usa
+                il file indicato alla creazione della rete.
             event (str, opzionale): Descrizione dell'evento da registrare. Default "".
+            timestamp (str, opzionale): Timestamp già formattato da riutilizzare.
+                Default None, calcolato al momento della chiamata.
         """
 
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Controlla se il file esiste già
-        file_exists = os.path.isfile(filename)
-        with open(filename, "a") as log_file:
-            # Aggiungi l'intestazione se il file è nuovo
-            if not file_exists:
-                log_file.write("Log della Simulazione del Protocollo RIP\n")
-                log_file.write("=" * 40 + "\n")
-                log_file.write("Questo file contiene le tabelle di routing e gli eventi registrati durante la simulazione.\n")
-                log_file.write("Ogni voce include un timestamp e una descrizione dell'evento.\n")
-                log_file.write("=" * 40 + "\n\n")
-            
-            log_file.write(f"\n[{timestamp}] {event}\n")
-            log_file.write("-" * 40 + "\n")
-            for node_name, node in self.nodes.items():
-                log_file.write(f"Routing Table for Node {node_name}:\n")
-                log_file.write("{:<12} {:<10} {:<10}\n".format("Destination", "Cost", "Next Hop"))
-                log_file.write("-" * 34 + "\n")
-                for dest, (cost, hop) in node.routingTable.items():
-                    hop = hop if hop is not None else "N/A"
-                    log_file.write("{:<12} {:<10} {:<10}\n".format(dest, cost, hop))
-                log_file.write("-" * 40 + "\n")
+        if timestamp is None:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if filename is None:
+            filename = self._log_filename
+        if filename is None:
+            print("Errore: nessun file di log indicato (né filename né log_path).")
+            return
+        if self._log_fh is None or filename != self._log_fh.name:
+            self._openLog(filename)
+        # Il blocco viene composto in memoria e scritto con una sola write
+        parts = []
+        # Aggiungi l'intestazione se il file è nuovo
+        if not self._log_header_written:
+            parts.append("Log della Simulazione del Protocollo RIP\n")
+            parts.append("=" * 40 + "\n")
+            parts.append("Questo file contiene le tabelle di routing e gli eventi registrati durante la simulazione.\n")
+            parts.append("Ogni voce include un timestamp e una descrizione dell'evento.\n")
+            parts.append("=" * 40 + "\n\n")
+            self._log_header_written = True
+
+        parts.append(f"\n[{timestamp}] {event}\n")
+        parts.append("-" * 40 + "\n")
+        for node_name, node in self.nodes.items():
+            parts.append(f"Routing Table for Node {node_name}:\n")
+            parts.append(_TABLE_HEADER)
+            for dest, cost, hop in node.routes():
+                hop = hop if hop is not None else "N/A"
+                parts.append(_ROW_FMT(dest, cost, hop))
+            parts.append("-" * 40 + "\n")
+
+        self._log_fh.write("".join(parts))
 
 
     def printRoutingTables(self):
         """
         Stampa le tabelle di routing di tutti i nodi nella rete in formato tabellare.
         """
+        parts = []
         for node_name, node in self.nodes.items():
-            print(f"Routing Table for Node {node_name}:")
-            print("{:<12} {:<10} {:<10}".format("Destination", "Cost", "Next Hop"))
-            print("-" * 34)
-            for dest, (cost, hop) in node.routingTable.items():
+            parts.append(f"Routing Table for Node {node_name}:\n")
+            parts.append(_TABLE_HEADER)
+            for dest, cost, hop in node.routes():
                 # Sostituisci None con "N/A" per evitare errori
                 hop = hop if hop is not None else "N/A"
-                print("{:<12} {:<10} {:<10}".format(dest, cost, hop))
-            print("-" * 40)
-
-
-# Creazione della rete
-network = Network()
-network.addNode('A')
-network.addNode('B')
-network.addNode('C')
-
-# Connessioni tra i nodi
-network.connectNodes('A', 'B', 1)
-network.connectNodes('B', 'C', 1)
-network.connectNodes('A', 'C', 4)
-
-# Nome del file di log
-log_file = "networkLog.txt"
-
-# Stato iniziale
-print("\n" + "=" * 40 + "\nStato iniziale della rete:")
-network.printRoutingTables()
-network.logRoutingTables(log_file, event="Stato iniziale della rete")
-start_time_initial = time.time()
-
-# Misura del tempo di convergenza iniziale
-print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (iniziale):")
-for iteration in range(100):  # Limita a 100 iterazioni per sicurezza
-    print(f"\nIterazione {iteration + 1}:")
-    updated = network.simulateIteration()
-    network.printRoutingTables()
-    network.logRoutingTables(log_file, event=f"Iterazione {iteration + 1} (iniziale)")
-    if not updated:
-        print(f"La rete è convergente dopo {iteration + 1} iterazioni.")
-        break
-    if iteration == 99:
-        print("Attenzione: la rete non è convergente dopo 100 iterazioni.")
-
-end_time_initial = time.time()  # Fine tempo simulazione iniziale
-print(f"Tempo totale per la convergenza iniziale: {end_time_initial - start_time_initial:.2f} secondi")
+                parts.append(_ROW_FMT(dest, cost, hop))
+            parts.append("-" * 40 + "\n")
+        sys.stdout.write("".join(parts))
 
+    def checkRoutingTables(self):
+        """
+        Confronta i costi delle tabelle di routing con i cammini minimi
+        calcolati con Dijkstra sui collegamenti attivi, limitati a INFINITY.
 
-# Simula un guasto tra A e B
-print("\n" + "=" * 40 + "\nSimulazione di un guasto (link A-B interrotto):")
-network.simulateFailure('A', 'B')
-network.printRoutingTables()
-network.logRoutingTables(log_file, event="Guasto tra A e B")
-
-print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (dopo il guasto):")
-start_time_post_failure = time.time()
+        Ritorna:
+            list: Nomi dei nodi la cui tabella non corrisponde ai cammini minimi.
+        """
 
-# Simulazione del RIP dopo il guasto
-print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (dopo il guasto):")
-for iteration in range(100):  # Limita a 100 iterazioni per sicurezza
-    print(f"\nIterazione {iteration + 1}:")
-    updated = network.simulateIteration()
+        wrong = []
+        for source in self._nodes_by_id:
+            distance = [INFINITY] * len(self._nodes_by_id)
+            distance[source.id] = 0
+            heap = [(0, source.id)]
+            while heap:
+                d, nodeId = heapq.heappop(heap)
+                if d > distance[nodeId]:
+                    continue
+                for neighborId, linkCost in self._nodes_by_id[nodeId].neighbors:
+                    if d + linkCost < distance[neighborId]:
+                        distance[neighborId] = d + linkCost
+                        heapq.heappush(heap, (d + linkCost, neighborId))
+            if source.cost != distance:
+                wrong.append(source.name)
+        return wrong
+
+
+def main():
+    """
+    Esegue la simulazione dimostrativa: crea una rete di tre nodi, la porta
+    a convergenza, interrompe il collegamento A-B e misura la nuova convergenza.
+    """
+
+    # Creazione della rete
+    network = Network()
+    network.addNode('A')
+    network.addNode('B')
+    network.addNode('C')
+
+    # Connessioni tra i nodi
+    network.connectNodes('A', 'B', 1)
+    network.connectNodes('B', 'C', 1)
+    network.connectNodes('A', 'C', 4)
+
+    # Nome del file di log
+    log_file = "networkLog.txt"
+
+    # Se True stampa e registra le tabelle a ogni iterazione; altrimenti solo
+    # gli stati iniziale, dopo il guasto e a convergenza, fuori dalle misure di tempo
+    VERBOSE = False
+
+    # Stato iniziale
+    print("\n" + "=" * 40 + "\nStato iniziale della rete:")
     network.printRoutingTables()
-    network.logRoutingTables(log_file, event=f"Iterazione {iteration + 1} (dopo guasto)")
-    if not updated:
-        print(f"La rete è convergente dopo {iteration + 1} iterazioni.")
-        break
-    if iteration == 99:
+    network.logRoutingTables(log_file, event="Stato iniziale della rete")
+    start_time_initial = time.time()
+
+    # Misura del tempo di convergenza iniziale
+    print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (iniziale):")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")  # Risoluzione al secondo: calcolato una volta
+    iteration = 0
+    # Si itera finché ci sono nodi da rielaborare (limite di 100 iterazioni per sicurezza)
+    while network.dirty and iteration < 100:
+        network.simulateIteration()
+        iteration += 1
+        if VERBOSE:
+            print(f"\nIterazione {iteration}:")
+            network.printRoutingTables()
+            network.logRoutingTables(log_file, event=f"Iterazione {iteration} (iniziale)", timestamp=timestamp)
+    end_time_initial = time.time()  # Fine tempo simulazione iniziale, esclusa la verifica
+    wrong_nodes = network.checkRoutingTables()
+    if network.dirty:
         print("Attenzione: la rete non è convergente dopo 100 iterazioni.")
+    elif wrong_nodes:
+        # Coda vuota ma tabelle diverse dai cammini minimi
+        print(f"Attenzione: tabelle errate per i nodi {', '.join(wrong_nodes)}.")
+    else:
+        print(f"La rete è convergente dopo {iteration} iterazioni.")
+
+    print(f"Tempo totale per la convergenza iniziale: {end_time_initial - start_time_initial:.2f} secondi")
+    if not VERBOSE:
+        print("\n" + "=" * 40 + "\nStato della rete dopo la convergenza iniziale:")
+        network.printRoutingTables()
+        network.logRoutingTables(log_file, event="Convergenza iniziale")
+
+
+    # Simula un guasto tra A e B
+    print("\n" + "=" * 40 + "\nSimulazione di un guasto (link A-B interrotto):")
+    network.simulateFailure('A', 'B')
+    network.printRoutingTables()
+    network.logRoutingTables(log_file, event="Guasto tra A e B")
+
+    print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (dopo il guasto):")
+    start_time_post_failure = time.time()
+
+    # Simulazione del RIP dopo il guasto
+    print("\n" + "=" * 40 + "\nSimulazione del protocollo RIP (dopo il guasto):")
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    iteration = 0
+    # Si itera finché ci sono nodi da rielaborare (limite di 100 iterazioni per sicurezza)
+    while network.dirty and iteration < 100:
+        network.simulateIteration()
+        iteration += 1
+        if VERBOSE:
+            print(f"\nIterazione {iteration}:")
+            network.printRoutingTables()
+            network.logRoutingTables(log_file, event=f"Iterazione {iteration} (dopo guasto)", timestamp=timestamp)
+    end_time_post_failure = time.time()  # Fine tempo simulazione post-guasto, esclusa la verifica
+    wrong_nodes = network.checkRoutingTables()
+    if network.dirty:
+        print("Attenzione: la rete non è convergente dopo 100 iterazioni.")
+    elif wrong_nodes:
+        # Coda vuota ma tabelle diverse dai cammini minimi
+        print(f"Attenzione: tabelle errate per i nodi {', '.join(wrong_nodes)}.")
+    else:
+        print(f"La rete è convergente dopo {iteration} iterazioni.")
+
+    print(f"Tempo totale per la convergenza dopo il guasto: {end_time_post_failure - start_time_post_failure:.2f} secondi")
+    if not VERBOSE:
+        print("\n" + "=" * 40 + "\nStato finale della rete:")
+        network.printRoutingTables()
+        network.logRoutingTables(log_file, event="Convergenza dopo il guasto")
 
-end_time_post_failure = time.time()  # Fine tempo simulazione post-guasto
-print(f"Tempo totale per la convergenza dopo il guasto: {end_time_post_failure - start_time_post_failure:.2f} secondi")
 
+    total_time = (end_time_initial - start_time_initial) + (end_time_post_failure - start_time_post_failure)
+    print(f"Tempo totale per l'intera simulazione: {total_time:.2f} secondi")
+    network.logRoutingTables(log_file, event=f"Tempo totale per l'intera simulazione: {total_time:.2f} secondi")
 
-total_time = (end_time_initial - start_time_initial) + (end_time_post_failure - start_time_post_failure)
-print(f"Tempo totale per l'intera simulazione: {total_time:.2f} secondi")
-network.logRoutingTables(log_file, event=f"Tempo totale per l'intera simulazione: {total_time:.2f} secondi")
 
+if __name__ == "__main__":
+    main()
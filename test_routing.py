@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from main import Network
+
+
+def converge(network, limit=100):
+    """
+    Esegue iterazioni del protocollo finché la coda dei nodi da rielaborare è vuota.
+
+    Argomenti:
+        network (Network): Rete da portare a convergenza.
+        limit (int, opzionale): Numero massimo di iterazioni. Default 100.
+    """
+
+    iteration = 0
+    while network.dirty and iteration < limit:
+        network.simulateIteration()
+        iteration += 1
+
+
+class TestFailureConvergence(unittest.TestCase):
+    """
+    Verifica che dopo un guasto le tabelle di routing coincidano con i cammini minimi.
+    """
+
+    def assertShortestPaths(self, network):
+        self.assertFalse(network.dirty, "la rete non è convergente")
+        self.assertEqual(network.checkRoutingTables(), [])
+
+    def testLineFailure(self):
+        # Il guasto isola A: B e C non devono contare fino a infinito
+        network = Network()
+        for name in "ABC":
+            network.addNode(name)
+        network.connectNodes('A', 'B', 5)
+        network.connectNodes('B', 'C', 1)
+        converge(network)
+        network.simulateFailure('A', 'B')
+        converge(network)
+        self.assertShortestPaths(network)
+
+    def testTriangleFailure(self):
+        # Il cammino diretto 0-2 cade e il percorso via 1 costa di più
+        network = Network()
+        for name in "012":
+            network.addNode(name)
+        network.connectNodes('0', '1', 1)
+        network.connectNodes('1', '2', 5)
+        network.connectNodes('0', '2', 3)
+        converge(network)
+        network.simulateFailure('0', '2')
+        converge(network)
+        self.assertShortestPaths(network)
+
+    def testRandomFailures(self, cases=200, seed=0):
+        # Albero casuale per la connettività, più alcuni collegamenti extra
+        rng = random.Random(seed)
+        for case in range(cases):
+            with self.subTest(case=case):
+                size = rng.randint(3, 15)
+                network = Network()
+                for i in range(size):
+                    network.addNode(str(i))
+                links = [(str(rng.randrange(i)), str(i)) for i in range(1, size)]
+                for _ in range(rng.randint(0, size)):
+                    links.append(tuple(str(n) for n in rng.sample(range(size), 2)))
+                for node1, node2 in links:
+                    network.connectNodes(node1, node2, rng.randint(1, 8))
+                converge(network)
+                network.simulateFailure(*rng.choice(links))
+                converge(network)
+                self.assertShortestPaths(network)
+
+
+if __name__ == "__main__":
+    unittest.main()